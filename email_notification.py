@@ -1,6 +1,11 @@
+import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from dotenv import load_dotenv
+from notification import Notification
+
+load_dotenv()
 
 class EmailNotification(Notification):
     def __init__(self):
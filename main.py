@@ -1,99 +1,422 @@
+import copy
 import json
 import os
+import queue
 import sys
 import logging
 import shutil
 import schedule
-import time
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+import requests
+from requests.adapters import HTTPAdapter
 from pytube import YouTube, Playlist, Channel
+from pytube import request as pytube_request
+from pytube.helpers import target_directory
 from tqdm import tqdm
-from PyInquirer import prompt, Separator
 from colorama import Fore, Style, init
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize colorama for colored console output
 init(autoreset=True)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s]: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
 
+# Free space below which the cached disk usage estimate is refreshed from the filesystem
+DISK_SAFETY_MARGIN = 1024 ** 3
+
+# Upper bound on parallel playlist downloads, however high max_workers is set
+MAX_WORKERS_LIMIT = 16
+
+# Number of finished (url, quality, path) downloads remembered to skip repeat lookups
+COMPLETED_CACHE_SIZE = 4096
+
+# Seconds to wait for queued notifications to send before giving up at shutdown
+NOTIFICATION_FLUSH_TIMEOUT = 30
+
+# Buffer size for writing downloaded video bytes to disk
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Parsed config files keyed by resolved path, stored as ((mtime_ns, size), config)
+_CONFIG_CACHE = {}
+
+def config_cache_key(config_file: Path) -> tuple:
+    stat = config_file.stat()
+    return config_file.resolve(), (stat.st_mtime_ns, stat.st_size)
+
+# Expected type of each known config key; values of another type are reported on load and read as unset
+CONFIG_SCHEMA = {
+    'quality': str,
+    'download_path': str,
+    'max_workers': int,
+    'auto_download': list,
+    'notification': str,
+}
+
+def validate_config(config) -> dict:
+    if not isinstance(config, dict):
+        raise ValueError("config must be a JSON object")
+    for key, expected_type in CONFIG_SCHEMA.items():
+        if key in config and not isinstance(config[key], expected_type):
+            logging.warning(f"Ignoring config value for '{key}': expected {expected_type.__name__}")
+    return config
+
+def json_loads(data: bytes):
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+ACTION_QUESTION = [
+    {
+        'type': 'list',
+        'name': 'action',
+        'message': 'What do you want to do?',
+        'choices': ['Download a single video', 'Download a playlist', 'Download from a channel']
+    }
+]
+
+URL_QUESTION = [{'type': 'input', 'name': 'url', 'message': 'Enter the URL:'}]
+
+class SessionResponse:
+    # Exposes the parts of the urlopen response interface that pytube.request relies on
+    def __init__(self, response: requests.Response) -> None:
+        self._response = response
+
+    def read(self, amt=None) -> bytes:
+        return self._response.raw.read(amt, decode_content=True)
+
+    def info(self):
+        return self._response.headers
+
+# Shared keep-alive session behind pytube's requests; created once by install_http_session()
+_HTTP_SESSION = None
+_HTTP_POOL_SIZE = 0
+
+def execute_request(url, method=None, headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    base_headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+    if headers:
+        base_headers.update(headers)
+    if data and not isinstance(data, bytes):
+        data = json.dumps(data).encode('utf-8')
+    if not url.lower().startswith('http'):
+        raise ValueError("Invalid URL")
+    if not isinstance(timeout, (int, float)):
+        timeout = None
+    method = method or 'GET'
+    try:
+        response = _HTTP_SESSION.request(method, url, headers=base_headers, data=data, timeout=timeout, stream=method != 'HEAD')
+    except requests.RequestException as e:
+        raise URLError(e)
+    if response.status_code >= 400:
+        raise HTTPError(url, response.status_code, response.reason, response.headers, None)
+    return SessionResponse(response)
+
+def install_http_session() -> None:
+    # pytube opens a fresh urlopen connection per request; route them through one pooled keep-alive session.
+    # This replaces the private pytube.request._execute_request(url, method, headers, data, timeout) of
+    # pytube 12 through 15, whose callers only use read() and info() on the result; recheck it on upgrades.
+    global _HTTP_SESSION
+    if _HTTP_SESSION is not None:
+        return
+    _HTTP_SESSION = requests.Session()
+    pytube_request._execute_request = execute_request
+
+def resize_http_session(pool_size: int) -> None:
+    # Keep enough pooled connections for every worker; swapping adapters leaves the patched pytube untouched
+    global _HTTP_POOL_SIZE
+    if _HTTP_SESSION is None or pool_size == _HTTP_POOL_SIZE:
+        return
+    old_adapter = _HTTP_SESSION.get_adapter('https://')
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    _HTTP_SESSION.mount('https://', adapter)
+    _HTTP_SESSION.mount('http://', adapter)
+    old_adapter.close()
+    _HTTP_POOL_SIZE = pool_size
+
+def resolution_value(stream) -> int:
+    return int(stream.resolution[:-1]) if stream.resolution else 0
+
+def existing_parent(path: str) -> str:
+    # Channel subdirectories may not exist yet; measure the filesystem they will be created on
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        path = os.path.dirname(path)
+    return path
+
+def preallocate(file, size: int) -> bool:
+    # Reserving the whole file up front keeps parallel downloads from fragmenting each other on disk
+    if not size or not hasattr(os, 'posix_fallocate'):
+        return False
+    try:
+        os.posix_fallocate(file.fileno(), 0, size)
+        return True
+    except OSError as e:
+        logging.debug(f"Preallocation not supported, writing without it: {e}")
+        return False
+
 class YouTubeDownloader:
     def __init__(self, config_file: str = 'config.json') -> None:
-        self.config_file = config_file
-        self.config = self.load_config(config_file)
+        self.config_file = Path(config_file)
+        self.config = self.load_config(self.config_file)
+        self._config_stamp = self.config_file_stamp()
+        resize_http_session(self.max_workers() * 2)
+        self._disk_lock = threading.Lock()
+        self._free_space_estimates = {}
+        self._reserved_bytes = {}
+        self._stop_event = threading.Event()
+        self._completed = OrderedDict()
+        self._completed_lock = threading.Lock()
+        self._notifier = None
+        self._notifier_type = None
+        self._notification_queue = queue.Queue()
+        self._notification_lock = threading.Lock()
+        self._notification_thread = None
+        self._notifications_done = threading.Condition()
+        self._pending_notifications = 0
         self.menu()
 
-    def load_config(self, config_file: str) -> dict:
+    def read_config(self, config_file: Path) -> tuple:
+        # Raises on a missing or unparsable file; returns (file_stamp, config) for what was actually read
+        cache_key, file_stamp = config_cache_key(config_file)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached and cached[0] == file_stamp:
+            return file_stamp, copy.deepcopy(cached[1])
+        config = validate_config(json_loads(config_file.read_bytes()))
+        _CONFIG_CACHE[cache_key] = (file_stamp, config)
+        # Deep copies so in-place edits of nested values (e.g. auto_download) never reach the cache
+        return file_stamp, copy.deepcopy(config)
+
+    def load_config(self, config_file: Path) -> dict:
         try:
-            if not os.path.exists(config_file):
-                logging.info("No config file found, creating a new one.")
-                return {}
-            with open(config_file, 'r') as file:
-                return json.load(file)
+            return self.read_config(config_file)[1]
+        except FileNotFoundError:
+            logging.info("No config file found, creating a new one.")
+            return {}
         except Exception as e:
             logging.error(f"Failed to load config: {e}")
             return {}
 
+    def config_file_stamp(self):
+        try:
+            return config_cache_key(self.config_file)[1]
+        except FileNotFoundError:
+            return None
+
+    def reload_config_if_changed(self) -> None:
+        file_stamp = self.config_file_stamp()
+        if file_stamp is None or file_stamp == self._config_stamp:
+            return
+        try:
+            file_stamp, config = self.read_config(self.config_file)
+        except Exception as e:
+            # Likely caught mid-edit or mistyped; keep the current settings and retry on the next run
+            logging.error(f"Failed to reload config, keeping current settings: {e}")
+            return
+        self.config = config
+        self._config_stamp = file_stamp
+        resize_http_session(self.max_workers() * 2)
+        logging.info("Config file changed on disk, reloaded settings.")
+
+    def config_unchanged(self) -> bool:
+        try:
+            cache_key, file_stamp = config_cache_key(self.config_file)
+        except FileNotFoundError:
+            return False
+        cached = _CONFIG_CACHE.get(cache_key)
+        return bool(cached) and cached[0] == file_stamp and cached[1] == self.config
+
     def save_config(self) -> None:
         try:
-            with open(self.config_file, 'w') as file:
-                json.dump(self.config, file, indent=4)
+            if self.config_unchanged():
+                print(Fore.GREEN + "Configuration already up to date.")
+                return
+            # Write to a temporary file and swap it in so a crash never leaves a truncated config
+            tmp_file = self.config_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(json_dumps(self.config))
+            os.replace(tmp_file, self.config_file)
+            # Seed the cache with what was just written so the next load skips parsing it again
+            cache_key, file_stamp = config_cache_key(self.config_file)
+            _CONFIG_CACHE[cache_key] = (file_stamp, copy.deepcopy(self.config))
+            self._config_stamp = file_stamp
             print(Fore.GREEN + "Configuration saved.")
         except Exception as e:
             print(Fore.RED + f"Failed to save config: {e}")
             logging.error(f"Failed to save config: {e}")
 
+    def get_setting(self, key: str, default):
+        # Wrong-typed values stay in self.config so saving writes them back untouched; readers get the default
+        value = self.config.get(key, default)
+        return value if isinstance(value, CONFIG_SCHEMA[key]) else default
+
     def get_config_value(self, key: str, prompt_msg: str) -> str:
-        if key in self.config:
+        if self.get_setting(key, None) is not None:
             return self.config[key]
         else:
             value = input(prompt_msg)
             self.config[key] = value
             return value
 
+    def max_workers(self) -> int:
+        return max(1, min(MAX_WORKERS_LIMIT, self.get_setting('max_workers', 4)))
+
     def check_disk_space(self, required_space: int, download_path: str) -> bool:
         try:
-            free_space = shutil.disk_usage(download_path).free
-            if free_space < required_space:
-                print(Fore.RED + "Insufficient disk space for download.")
-                return False
-            return True
+            path = existing_parent(download_path)
+            device = os.stat(path).st_dev
+            with self._disk_lock:
+                # Draw down a per-filesystem estimate and only statfs again once headroom gets close to the margin
+                estimate = self._free_space_estimates.get(device)
+                if estimate is None or estimate - required_space < DISK_SAFETY_MARGIN:
+                    estimate = shutil.disk_usage(path).free - self._reserved_bytes.get(device, 0)
+                if estimate < required_space:
+                    self._free_space_estimates[device] = estimate
+                    tqdm.write(Fore.RED + "Insufficient disk space for download.")
+                    return False
+                self._free_space_estimates[device] = estimate - required_space
+                self._reserved_bytes[device] = self._reserved_bytes.get(device, 0) + required_space
+                return True
         except Exception as e:
-            print(Fore.RED + f"Failed to check disk space: {e}")
+            tqdm.write(Fore.RED + f"Failed to check disk space: {e}")
             logging.error(f"Failed to check disk space: {e}")
             return False
 
-    def download_video(self, video_url: str, quality: str, download_path: str) -> None:
-        yt = YouTube(video_url)
-        stream = self.get_best_stream(yt, quality)
-        if stream:
-            if self.check_disk_space(stream.filesize, download_path):
-                self.download_stream(stream, yt.title, download_path)
-            else:
-                print(Fore.RED + "Download aborted due to insufficient disk space.")
-        else:
-            print(Fore.RED + "No suitable stream found for the requested quality.")
+    def release_disk_space(self, reserved_space: int, download_path: str) -> None:
+        if not reserved_space:
+            return
+        device = os.stat(existing_parent(download_path)).st_dev
+        with self._disk_lock:
+            self._reserved_bytes[device] = max(0, self._reserved_bytes.get(device, 0) - reserved_space)
+
+    def reset_disk_space_estimates(self) -> None:
+        with self._disk_lock:
+            self._free_space_estimates.clear()
+
+    def download_video(self, video_url: str, quality: str, download_path: str, show_progress: bool = True, concurrent: bool = False) -> None:
+        # Scheduled runs revisit the same playlists; skip metadata lookups for videos already fetched
+        completed_key = (video_url, quality, download_path)
+        if self.is_completed(completed_key):
+            return
+        yt, stream = self.resolve_video(video_url, quality)
+        if not stream:
+            tqdm.write(Fore.RED + "No suitable stream found for the requested quality.")
+            return
+        if self.download_stream(stream, yt.title, download_path, show_progress, concurrent):
+            self.mark_completed(completed_key)
+
+    def is_completed(self, key: tuple) -> bool:
+        with self._completed_lock:
+            if key not in self._completed:
+                return False
+            self._completed.move_to_end(key)
+            return True
+
+    def mark_completed(self, key: tuple) -> None:
+        with self._completed_lock:
+            self._completed[key] = None
+            self._completed.move_to_end(key)
+            if len(self._completed) > COMPLETED_CACHE_SIZE:
+                self._completed.popitem(last=False)
 
     def download_playlist(self, playlist_url: str, quality: str, download_path: str) -> None:
-        playlist = Playlist(playlist_url)
-        total_size = sum(self.get_best_stream(YouTube(url), quality).filesize for url in playlist.video_urls if self.get_best_stream(YouTube(url), quality))
-        if self.check_disk_space(total_size, download_path):
-            for video_url in tqdm(playlist.video_urls, desc="Downloading Playlist"):
-                self.download_video(video_url, quality, download_path)
-        else:
-            print(Fore.RED + "Download aborted due to insufficient disk space.")
+        self.download_playlists([playlist_url], quality, download_path)
+
+    def download_playlists(self, playlist_urls: list, quality: str, download_path: str) -> None:
+        # Start each run from a fresh statfs so space used since the last run is seen
+        self.reset_disk_space_estimates()
+        with ThreadPoolExecutor(max_workers=self.max_workers()) as executor:
+            # video_urls pages in lazily, so the first download starts before enumeration finishes.
+            # Workers draw no per-video bars and report through tqdm.write, keeping the playlist bar intact.
+            futures = []
+            seen = set()
+            for playlist_url in playlist_urls:
+                for url in Playlist(playlist_url).video_urls:
+                    # Playlists often share videos; two workers writing the same file would clobber each other
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    futures.append(executor.submit(self.download_video, url, quality, download_path, show_progress=False, concurrent=True))
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading Playlist"):
+                try:
+                    future.result()
+                except Exception as e:
+                    tqdm.write(Fore.RED + f"Failed to download video: {e}")
+                    logging.error(f"Failed to download video: {e}")
+
+    def resolve_video(self, video_url: str, quality: str) -> tuple:
+        yt = YouTube(video_url)
+        return yt, self.get_best_stream(yt, quality)
 
     def get_best_stream(self, yt: YouTube, quality: str):
-        stream = yt.streams.filter(res=quality, file_extension='mp4').first()
-        if not stream:
-            stream = yt.streams.filter(progressive=True, file_extension='mp4').order_by('resolution').desc().first()
-        return stream
+        # One pass over the streams: stop at an exact mp4 match, tracking the best progressive mp4 as fallback
+        fallback = None
+        for stream in yt.streams:
+            if stream.subtype != 'mp4':
+                continue
+            if stream.resolution == quality:
+                return stream
+            if stream.is_progressive and (fallback is None or resolution_value(stream) > resolution_value(fallback)):
+                fallback = stream
+        return fallback
 
-    def download_stream(self, stream, title: str, download_path: str) -> None:
-        with tqdm(desc=f"Downloading {title}", total=stream.filesize, unit='B', unit_scale=True, unit_divisor=1024) as pbar:
-            stream.download(output_path=download_path, filename=title, on_progress_callback=lambda chunk, _, total: pbar.update(len(chunk)))
-        print(Fore.GREEN + f"'{title}' downloaded successfully.")
+    def download_stream(self, stream, title: str, download_path: str, show_progress: bool = True, concurrent: bool = False) -> bool:
+        file_path = os.path.join(target_directory(download_path), title)
+        filesize = stream.filesize
+        if os.path.isfile(file_path) and os.path.getsize(file_path) == filesize:
+            logging.info(f"'{title}' already exists, skipping download.")
+            return True
+        if not self.check_disk_space(filesize, download_path):
+            tqdm.write(Fore.RED + "Download aborted due to insufficient disk space.")
+            return False
+        reserved = filesize
+        try:
+            with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+                # A lone download gains nothing from preallocation, so only pay for it when writes interleave
+                if concurrent and preallocate(file, filesize):
+                    # The blocks are now taken on disk and show up in statfs, so stop counting the reservation
+                    self.release_disk_space(reserved, download_path)
+                    reserved = 0
+                self.write_stream(stream, title, file, show_progress)
+        finally:
+            self.release_disk_space(reserved, download_path)
+        tqdm.write(Fore.GREEN + f"'{title}' downloaded successfully.")
+        return True
+
+    def write_stream(self, stream, title: str, file, show_progress: bool = True) -> None:
+        with tqdm(desc=f"Downloading {title}", total=stream.filesize, unit='B', unit_scale=True, unit_divisor=1024, disable=not show_progress) as pbar:
+            write, update = file.write, pbar.update
+            try:
+                try:
+                    for chunk in pytube_request.stream(stream.url):
+                        update(write(chunk))
+                except HTTPError as e:
+                    if e.code != 404:
+                        raise
+                    # Segmented (OTF) streams reject range requests; fetch them sequentially like Stream.download does
+                    file.seek(0)
+                    pbar.reset()
+                    for chunk in pytube_request.seq_stream(stream.url):
+                        update(write(chunk))
+            finally:
+                # Drop any preallocated tail so a partial download is never mistaken for a finished one
+                file.truncate()
 
     def handle_channel(self, channel_url: str, quality: str, download_path: str) -> None:
+        from PyInquirer import prompt
+
         channel = Channel(channel_url)
         playlists = list(channel.playlists)
         playlist_choices = [{'name': pl.title, 'value': pl.playlist_url} for pl in playlists]
@@ -110,74 +433,125 @@ class YouTubeDownloader:
         ]
 
         selected_playlists = prompt(questions)['selected_playlists']
-        for playlist_url in selected_playlists:
-            self.download_playlist(playlist_url, quality, os.path.join(download_path, channel.channel_name))
+        self.download_playlists(selected_playlists, quality, os.path.join(download_path, channel.channel_name))
 
     def auto_download_task(self):
-        for item in self.config.get('auto_download', []):
+        # Pick up edits made to the config file since the last run; costs one stat when nothing changed
+        self.reload_config_if_changed()
+        quality = self.get_setting('quality', '1080p')
+        download_path = self.get_setting('download_path', './downloads')
+        playlist_urls = []
+        for item in self.get_setting('auto_download', []):
             if "playlist" in item:
-                self.download_playlist(item, self.config.get('quality', '1080p'), self.config.get('download_path', './downloads'))
+                playlist_urls.append(item)
             elif "channel" in item:
-                self.handle_channel(item, self.config.get('quality', '1080p'), self.config.get('download_path', './downloads'))
+                self.handle_channel(item, quality, download_path)
             else:
                 logging.warning(f"Unsupported URL in auto_download: {item}")
+        if playlist_urls:
+            # One shared pool, so every configured playlist is fetched concurrently rather than in turn
+            self.download_playlists(playlist_urls, quality, download_path)
 
     def schedule_downloads(self, interval=1):
         schedule.every(interval).hours.do(self.auto_download_task)
-        while True:
+        while not self._stop_event.is_set():
+            idle = schedule.idle_seconds()
+            if idle is None:
+                break
+            # Sleep until the next job is due rather than polling; stop_schedule() wakes this early
+            if idle > 0 and self._stop_event.wait(timeout=idle):
+                break
             schedule.run_pending()
-            time.sleep(1)
+
+    def stop_schedule(self) -> None:
+        self._stop_event.set()
     
-    def send_notification(self, message: str):
-        notifier_type = self.config.get('notification', 'email')  # Default to email
-        notifier = None
+    def send_notification(self, message: str) -> None:
+        # Slack/SMTP calls block for hundreds of ms; queue the message so callers never wait on delivery
+        with self._notification_lock:
+            if self._notification_thread is None:
+                self._notification_thread = threading.Thread(target=self.process_notifications, daemon=True)
+                self._notification_thread.start()
+        with self._notifications_done:
+            self._pending_notifications += 1
+        self._notification_queue.put(message)
 
-        try:
+    def process_notifications(self) -> None:
+        while True:
+            message = self._notification_queue.get()
+            try:
+                self.deliver_notification(message)
+            finally:
+                with self._notifications_done:
+                    self._pending_notifications -= 1
+                    self._notifications_done.notify_all()
+
+    def flush_notifications(self, timeout: float = NOTIFICATION_FLUSH_TIMEOUT) -> bool:
+        # Queue.join() has no timeout, and a hung SMTP connect must not block shutdown forever
+        with self._notifications_done:
+            flushed = self._notifications_done.wait_for(lambda: not self._pending_notifications, timeout=timeout)
+        if not flushed:
+            logging.warning("Timed out waiting for pending notifications to send.")
+        return flushed
+
+    def get_notifier(self):
+        notifier_type = self.get_setting('notification', 'email')  # Default to email
+        # Build the notifier once and reuse it until the configured type changes
+        if self._notifier is None or self._notifier_type != notifier_type:
             if notifier_type == 'slack':
-                notifier = SlackNotification()
+                from slack_notification import SlackNotification
+                self._notifier = SlackNotification()
             elif notifier_type == 'email':
-                notifier = EmailNotification()
+                from email_notification import EmailNotification
+                self._notifier = EmailNotification()
             else:
-                print(Fore.RED + f"Unsupported notifier type: {notifier_type}")
+                return None
+            self._notifier_type = notifier_type
+        return self._notifier
+
+    def deliver_notification(self, message: str):
+        try:
+            notifier = self.get_notifier()
+            if notifier is None:
+                notifier_type = self.get_setting('notification', 'email')
+                tqdm.write(Fore.RED + f"Unsupported notifier type: {notifier_type}")
                 logging.error(f"Unsupported notifier type: {notifier_type}")
                 return
 
             notifier.send(message)
-            print(Fore.GREEN + "Notification sent successfully.")
+            tqdm.write(Fore.GREEN + "Notification sent successfully.")
         except Exception as e:
-            print(Fore.RED + f"Failed to send notification: {e}")
+            tqdm.write(Fore.RED + f"Failed to send notification: {e}")
             logging.error(f"Failed to send notification: {e}")
     
     def menu(self) -> None:
-        print("\nWelcome to YouTubeDownloader")
-        action_question = [
-            {
-                'type': 'list',
-                'name': 'action',
-                'message': 'What do you want to do?',
-                'choices': ['Download a single video', 'Download a playlist', 'Download from a channel']
-            }
-        ]
-        action_answer = prompt(action_question)
+        # PyInquirer drags in prompt_toolkit, so it is only imported by the methods that prompt
+        from PyInquirer import prompt
 
-        url_question = [{'type': 'input', 'name': 'url', 'message': 'Enter the URL:'}]
-        url_answer = prompt(url_question)['url']
+        print("\nWelcome to YouTubeDownloader")
+        action = prompt(ACTION_QUESTION)['action']
+        url_answer = prompt(URL_QUESTION)['url']
 
         quality = self.get_config_value('quality', 'Enter preferred video quality (e.g., 720p, 1080p): ')
         download_path = self.get_config_value('download_path', 'Enter download path (./downloads): ')
 
-        if action_answer['action'] == 'Download a single video':
+        if action == 'Download a single video':
             self.download_video(url_answer, quality, download_path)
-        elif action_answer['action'] == 'Download a playlist':
+        elif action == 'Download a playlist':
             self.download_playlist(url_answer, quality, download_path)
-        elif action_answer['action'] == 'Download from a channel':
+        elif action == 'Download from a channel':
             self.handle_channel(url_answer, quality, download_path)
 
         if input("Update config with these settings? (y/n): ").lower() == 'y':
             self.save_config()
 
 if __name__ == '__main__':
+    install_http_session()
     downloader = YouTubeDownloader()
 
-    # This will block; consider running in a separate thread
-    downloader.schedule_downloads()
+    try:
+        # This will block; consider running in a separate thread
+        downloader.schedule_downloads()
+    finally:
+        # Runs on Ctrl+C too, so queued notifications still go out before the daemon worker dies
+        downloader.flush_notifications()
@@ -1,6 +1,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from notification import Notification
 
 load_dotenv()
 